@@ -1,4 +1,6 @@
+import re
 from enum import Enum
+from typing import Optional
 
 
 class CommentCommand(Enum):
@@ -16,11 +18,26 @@ COMMAND_DESCRIPTIONS = {
 }
 
 
-def get_command_usage_markdown() -> str:
-    lines = [
+_USAGE_MARKDOWN = "\n".join(
+    [
         "| Command | Description |",
         "|---------|-------------|",
+        *[f"| `{command.value}` | {description} |" for command, description in COMMAND_DESCRIPTIONS.items()],
     ]
-    for command, description in COMMAND_DESCRIPTIONS.items():
-        lines.append(f"| `{command.value}` | {description} |")
-    return "\n".join(lines)
+)
+
+
+def get_command_usage_markdown() -> str:
+    return _USAGE_MARKDOWN
+
+
+# One alternation over every command so a comment body is scanned once, not once per command
+_COMMAND_RE = re.compile("|".join(re.escape(command.value) for command in CommentCommand))
+
+
+def find_comment_command(comment_body: str) -> Optional[CommentCommand]:
+    """
+    Return the first command that appears in a comment body, or None if it contains no command.
+    """
+    match = _COMMAND_RE.search(comment_body)
+    return CommentCommand(match.group(0)) if match else None
@@ -4,9 +4,11 @@ Centralized configuration and environment variable handling for repoagent.
 
 from typing import Any, Optional
 
-from github_utils import GithubEvent
+from github_utils import GITHUB_EVENT_LOOKUP, GithubEvent
 from utils import get_env_var, get_github_event_payload
 
+_TRUTHY = frozenset({"1", "true", "yes"})
+
 
 class GitHubConfig:
     """
@@ -15,14 +17,16 @@ class GitHubConfig:
     Raises ValueError if required variables are missing or invalid.
     """
 
+    __slots__ = ("event_name", "issue_id", "token", "repository", "issue_comment_id")
+
     def __init__(self):
         # Get event name from GITHUB_EVENT_NAME
         event_name_str: str = get_env_var("GITHUB_EVENT_NAME", required=True)
 
         try:
-            self.event_name: GithubEvent = GithubEvent(event_name_str)
-        except ValueError:
-            raise ValueError(f"Invalid event name: {event_name_str}. Must be one of {[e.value for e in GithubEvent]}")
+            self.event_name: GithubEvent = GITHUB_EVENT_LOOKUP[event_name_str]
+        except KeyError:
+            raise ValueError(f"Invalid event name: {event_name_str}. Must be one of {list(GITHUB_EVENT_LOOKUP)}")
 
         # Get event payload for extracting issue and comment IDs
         event_payload = get_github_event_payload()
@@ -55,12 +59,15 @@ class GitHubConfig:
 class OpenAIConfig:
     """
     Handles OpenAI/Azure-related configuration values.
-    Parses environment variables for Azure OpenAI target URI and API key.
+    Parses environment variables for Azure OpenAI target URI, API key, and the optional completion cache directory.
     """
 
+    __slots__ = ("azure_openai_target_uri", "azure_openai_api_key", "completion_cache_dir")
+
     def __init__(self):
         self.azure_openai_target_uri: str = get_env_var("INPUT_AZURE_OPENAI_TARGET_URI")
         self.azure_openai_api_key: str = get_env_var("INPUT_AZURE_OPENAI_API_KEY")
+        self.completion_cache_dir: Optional[str] = get_env_var("INPUT_COMPLETION_CACHE_DIR", required=False)
 
 
 class Config:
@@ -70,33 +77,46 @@ class Config:
     Use this class to access all configuration values for the repoagent project.
     """
 
+    __slots__ = ("check_all", "github", "openai")
+
     check_all: bool
     github: GitHubConfig
     openai: OpenAIConfig
 
     def __init__(self) -> None:
-        self._initialized: bool = False
+        # A static method, so the cast is the same object for every instance and get_env_var's cache key is stable
         self.check_all: bool = get_env_var("INPUT_CHECK_ALL", default=False, cast_func=self._cast_bool, required=False)
         self.github = GitHubConfig()
         self.openai = OpenAIConfig()
-        self._initialized = True
-
-    def __setattr__(self, name: str, value: Any) -> None:
-        """
-        Prevents modification of config values after initialization.
-        """
-        if hasattr(self, "_initialized") and self._initialized and name != "_initialized":
-            raise AttributeError(f"Config is immutable. Cannot modify '{name}' after initialization.")
-        super().__setattr__(name, value)
+        # Swap in the frozen subclass so attribute writes during setup stay on the default fast path
+        self.__class__ = _FrozenConfig
 
-    def _cast_bool(self, val: str) -> bool:
+    @staticmethod
+    def _cast_bool(val: str) -> bool:
         """
         Casts a string value to boolean using common truthy values.
         """
-        return str(val).strip().lower() in ["1", "true", "yes"]
+        if not isinstance(val, str):
+            val = str(val)
+        return val.strip().lower() in _TRUTHY
 
     def get(self, key: str, default: Any = None) -> Any:
         """
         Returns the value of a config attribute, or a default if not present.
         """
         return getattr(self, key, default)
+
+
+class _FrozenConfig(Config):
+    """
+    Initialized Config; rejects any further attribute assignment.
+    """
+
+    # Must stay empty so the instance layout matches Config for the __class__ swap
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """
+        Prevents modification of config values after initialization.
+        """
+        raise AttributeError(f"Config is immutable. Cannot modify '{name}' after initialization.")
@@ -1,11 +1,25 @@
+import logging
 import sys
+import threading
 from enum import Enum
-from typing import List
+from typing import Dict, Iterable, List
 
-from github import Github
+from github import Auth, Github, GithubRetry
 from github.Issue import Issue
+from github.IssueComment import IssueComment
+
+logger = logging.getLogger(__name__)
 
 DISABLED_MARKER = "<!-- agent:disabled -->"
+_AI_HEADING = "AI-enhanced Evaluation"
+_AI_MARKER = _AI_HEADING.lower()
+_PAGE_SIZE = 100
+
+# Retries transient 5xx responses with backoff; rate-limited responses wait for Retry-After / X-RateLimit-Reset
+_RETRY = GithubRetry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])
+
+_CLIENTS: Dict[str, Github] = {}
+_CLIENTS_LOCK = threading.Lock()
 
 
 class GithubEvent(Enum):
@@ -13,6 +27,41 @@ class GithubEvent(Enum):
     ISSUE_COMMENT = "issue_comment"
 
 
+GITHUB_EVENT_LOOKUP = {event.value: event for event in GithubEvent}
+
+
+def _client(token: str) -> Github:
+    """
+    Return a shared GitHub client for the token so its HTTP connection pool is reused across calls.
+    """
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(token)
+        if client is None:
+            client = _CLIENTS[token] = Github(auth=Auth.Token(token), per_page=_PAGE_SIZE, retry=_RETRY)
+        return client
+
+
+def close_clients() -> None:
+    """
+    Close the connection pools of all shared GitHub clients. Call once when the agent is done.
+    """
+    for client in _CLIENTS.values():
+        client.close()
+    _CLIENTS.clear()
+
+
+def _comments_newest_first(issue: Issue) -> Iterable[IssueComment]:
+    """
+    Iterate an issue's comments from newest to oldest with as few requests as possible.
+    PyGithub's .reversed spends an extra request on page 1 just to find the last page, so it only pays off
+    when the comments span several pages; a single page is fetched once and reversed in memory.
+    """
+    comments = issue.get_comments()
+    if issue.comments <= _PAGE_SIZE:
+        return reversed(list(comments))
+    return comments.reversed
+
+
 def is_agent_disabled(issue: Issue) -> bool:
     """
     Checks if the GitHub issue has a comment containing the disabled marker.
@@ -23,10 +72,8 @@ def is_agent_disabled(issue: Issue) -> bool:
     Returns:
         bool: True if the agent is disabled for this issue, False otherwise.
     """
-    for comment in issue.get_comments():
-        if DISABLED_MARKER in comment.body:
-            return True
-    return False
+    # The disable marker is usually among the most recent comments, so scan newest first
+    return any(DISABLED_MARKER in comment.body for comment in _comments_newest_first(issue))
 
 
 def has_label(issue: Issue, label_name: str) -> bool:
@@ -42,7 +89,8 @@ def has_label(issue: Issue, label_name: str) -> bool:
     """
     if not hasattr(issue, "labels") or not isinstance(issue.labels, list):
         return False
-    return any(getattr(label, "name", "").lower() == label_name.lower() for label in issue.labels)
+    target = label_name.lower()
+    return any(label.name.lower() == target for label in issue.labels)
 
 
 def get_github_issue(token: str, repository: str, issue_id: int) -> Issue:
@@ -61,8 +109,9 @@ def get_github_issue(token: str, repository: str, issue_id: int) -> Issue:
         SystemExit: If the repository or issue cannot be found or accessed.
     """
     try:
-        github_client = Github(token)
-        repo = github_client.get_repo(repository)
+        github_client = _client(token)
+        # A lazy repository skips the extra GET for repo metadata the agent never reads
+        repo = github_client.get_repo(repository, lazy=True)
         issue = repo.get_issue(issue_id)
         return issue
     except Exception as e:
@@ -102,11 +151,14 @@ def get_ai_enhanced_comment(issue: Issue) -> str:
     Returns:
         str: The content of the AI-enhanced comment, or None if not found.
     """
-    for comment in reversed(list(issue.get_comments())):
-        if "AI-enhanced Evaluation".lower() in comment.body.lower():
-            print(f"Found AI-enhanced comment in issue #{issue.number} (comment id: {comment.id}).")
-            return comment.body
-    print(f"No AI-enhanced comment found in issue #{issue.number}.")
+    # The latest evaluation is almost always among the most recent comments
+    for comment in _comments_newest_first(issue):
+        # Check the heading as the agent writes it before falling back to a lower-cased copy of the body
+        body = comment.body
+        if _AI_HEADING in body or _AI_MARKER in body.lower():
+            logger.info("Found AI-enhanced comment in issue #%d (comment id: %d).", issue.number, comment.id)
+            return body
+    logger.info("No AI-enhanced comment found in issue #%d.", issue.number)
     return None
 
 
@@ -125,12 +177,12 @@ def get_github_comment(issue: Issue, comment_id: int):
         Exception: If the comment is not found or another error occurs.
     """
     try:
-        comments = issue.get_comments()
-        for comment in comments:
-            if comment.id == comment_id:
-                print(f"Found comment with id {comment_id} in issue #{issue.number}.")
-                return comment
-        raise Exception(f"Comment with id {comment_id} not found")
+        # Look the comment up by ID rather than paging through every comment on the issue
+        comment = issue.get_comment(comment_id)
+        if comment.issue_url != issue.url:
+            raise Exception(f"Comment with id {comment_id} not found")
+        logger.debug("Found comment with id %d in issue #%d.", comment_id, issue.number)
+        return comment
     except Exception as e:
         print(f"Error fetching GitHub comment: {type(e).__name__}: {e}", file=sys.stderr)
         raise
@@ -149,16 +201,19 @@ def update_github_issue(issue: Issue, title: str = None, body: str = None, label
     Returns:
         bool: True if the update was successful, False otherwise.
     """
+    fields = {}
+    if title:
+        fields["title"] = title
+    if body:
+        fields["body"] = body
+    if labels:
+        fields["labels"] = labels
+
     try:
-        if title is not None and title != "":
-            issue.edit(title=title)
-            print(f"Updated title for issue #{issue.number}.")
-        if body is not None and body != "":
-            issue.edit(body=body)
-            print(f"Updated body for issue #{issue.number}.")
-        if labels is not None and labels != []:
-            issue.edit(labels=labels)
-            print(f"Updated labels for issue #{issue.number}.")
+        if fields:
+            issue.edit(**fields)
+        for field in fields:
+            logger.info("Updated %s for issue #%d.", field, issue.number)
         return True
     except Exception as e:
         print(f"Error updating GitHub issue: {type(e).__name__}: {e}", file=sys.stderr)
@@ -179,6 +234,18 @@ def get_existing_labels(token: str, repository: str) -> List[str]:
     Raises:
         github.GithubException: If the repository cannot be accessed or labels cannot be fetched.
     """
-    github_client = Github(token)
-    repo_obj = github_client.get_repo(repository)
-    return [label.name for label in repo_obj.get_labels()]
+    # Query the labels endpoint directly and keep only the names, skipping the repository lookup
+    # and the construction of a Label object per entry
+    requester = _client(token).requester
+    label_names = []
+    page = 1
+    while True:
+        _, data = requester.requestJsonAndCheck(
+            "GET",
+            f"/repos/{repository}/labels",
+            parameters={"per_page": _PAGE_SIZE, "page": page},
+        )
+        label_names.extend(label["name"] for label in data)
+        if len(data) < _PAGE_SIZE:
+            return label_names
+        page += 1
@@ -1,17 +1,21 @@
 import asyncio
+import functools
+import logging
 import sys
+import textwrap
+from typing import TYPE_CHECKING, Callable, Optional
 
 # Third-party imports
 from github.Issue import Issue
-from semantic_kernel import Kernel
 
-from comment_commands import CommentCommand, get_command_usage_markdown
+from comment_commands import CommentCommand, find_comment_command, get_command_usage_markdown
 
 # Local imports
 from config import Config
 from github_utils import (
     DISABLED_MARKER,
     GithubEvent,
+    close_clients,
     create_github_issue_comment,
     get_ai_enhanced_comment,
     get_existing_labels,
@@ -20,31 +24,52 @@ from github_utils import (
     is_agent_disabled,
     update_github_issue,
 )
-from openai_utils import initialize_kernel, run_completion
-from prompts import build_user_story_eval_prompt
+from openai_utils import CompletionCache, initialize_kernel, run_completion
+from prompts import build_user_story_eval_prompt, is_placeholder_issue
 from response_models import UserStoryEvalResponse
 
+if TYPE_CHECKING:
+    from semantic_kernel import Kernel
+
 
 async def handle_github_issues_event(
-    issue: Issue, kernel: Kernel, existing_labels: list[str], is_manual_trigger: bool = False
+    issue: Issue,
+    get_kernel: Callable[[], "Kernel"],
+    existing_labels: list[str],
+    is_manual_trigger: bool = False,
+    completion_cache: Optional[CompletionCache] = None,
 ) -> None:
     """
     Generate an AI-enhanced evaluation for a GitHub issue and post it as a comment if not disabled.
 
     Args:
         issue (Issue): The GitHub issue to process.
-        kernel (Kernel): The initialized AI kernel for generating responses.
+        get_kernel (Callable[[], Kernel]): Returns the AI kernel; only called once a completion is needed.
         existing_labels (list): List of existing labels in the repository.
         is_manual_trigger (bool): Whether this is a manual review request; defaults to False.
+        completion_cache (CompletionCache, optional): Cache for model responses; bypassed for manual reviews,
+            which must always produce a fresh evaluation.
     """
     if not is_manual_trigger and is_agent_disabled(issue):
         print(f"Skipping automatic review for issue {issue.number} (disabled).")
         return
+
+    if is_placeholder_issue(issue.title, issue.body):
+        # The model would only report that the story is unclear, so answer directly without a completion
+        response_markdown = UserStoryEvalResponse.unclear_story(
+            "The issue is a placeholder and does not yet describe any work."
+        ).to_comment()
+        create_github_issue_comment(issue, response_markdown)
+        print(f"Posted placeholder notice for issue {issue.number} without running a completion.")
+        return
+
     messages = build_user_story_eval_prompt(issue.title, issue.body, existing_labels)
 
     try:
-        response_text = await run_completion(kernel, messages)
-        response_markdown = UserStoryEvalResponse.from_text(response_text).to_markdown()
+        response_text = await run_completion(
+            get_kernel(), messages, cache=None if is_manual_trigger else completion_cache
+        )
+        response_markdown = UserStoryEvalResponse.from_text(response_text).to_comment()
 
         create_github_issue_comment(issue, response_markdown)
         print(f"AI Response for Issue {issue.number} (Markdown):\n\n{response_markdown}")
@@ -53,55 +78,93 @@ async def handle_github_issues_event(
         sys.exit(1)
 
 
-async def handle_github_comment_event(
-    issue: Issue, issue_comment_id: int, kernel: Kernel, existing_labels: list[str]
-) -> None:
+async def _apply(issue: Issue, get_kernel: Callable[[], "Kernel"], existing_labels: list[str]) -> None:
     """
-    Apply AI-suggested enhancements to a GitHub issue, or trigger a re-review if requested in a comment.
-
-    Args:
-        issue (Issue): The GitHub issue to update.
-        issue_comment_id (int): The ID of the comment triggering the enhancement or review.
+    Apply the refactored story and labels from the latest AI-enhanced evaluation to the issue.
     """
-    comment = get_github_comment(issue, issue_comment_id)
-    comment_body = comment.body.strip().lower()
+    ai_enhanced_comment = get_ai_enhanced_comment(issue)
+    if ai_enhanced_comment is None:
+        return
 
-    if CommentCommand.APPLY.value in comment_body:
-        ai_enhanced_comment = get_ai_enhanced_comment(issue)
-        if ai_enhanced_comment is None:
-            return
+    user_story_eval = UserStoryEvalResponse.from_comment(ai_enhanced_comment)
+    # Only apply labels the repository already defines; GitHub would silently create any others. Label names are
+    # case-insensitive on GitHub, so match that way and use the repository's spelling.
+    known_labels = {name.casefold(): name for name in existing_labels}
+    labels = [known_labels[label.casefold()] for label in user_story_eval.labels if label.casefold() in known_labels]
 
-        user_story_eval = UserStoryEvalResponse.from_markdown(ai_enhanced_comment)
+    # Quote every line, blank ones included, so the whole evaluation stays in a single blockquote
+    quoted_body = textwrap.indent(user_story_eval.to_markdown().strip(), "> ", lambda line: True)
+    confirmation_comment = f"✅ Applied enhancements based on the following comment:\n\n" f"{quoted_body}"
 
-        update_github_issue(
+    # The PATCH and the confirmation POST are independent; run the blocking calls side by side
+    await asyncio.gather(
+        asyncio.to_thread(
+            update_github_issue,
             issue,
             title=user_story_eval.refactored.title,
             body=user_story_eval.refactored.body_markdown(),
-            labels=user_story_eval.labels,
-        )
+            labels=labels,
+        ),
+        asyncio.to_thread(create_github_issue_comment, issue, confirmation_comment),
+    )
 
-        quoted_body = "\n".join([f"> {line}" for line in user_story_eval.to_markdown().strip().splitlines()])
-        confirmation_comment = f"✅ Applied enhancements based on the following comment:\n\n" f"{quoted_body}"
 
-        create_github_issue_comment(issue, confirmation_comment)
+async def _review(issue: Issue, get_kernel: Callable[[], "Kernel"], existing_labels: list[str]) -> None:
+    """
+    Re-run the evaluation on request, even if automatic reviews are disabled.
+    """
+    print(f"Triggering manual review for issue {issue.number}...")
 
-    elif CommentCommand.REVIEW.value in comment_body:
-        print(f"Triggering manual review for issue {issue.number}...")
+    await handle_github_issues_event(issue, get_kernel, existing_labels, is_manual_trigger=True)
 
-        await handle_github_issues_event(issue, kernel, existing_labels, is_manual_trigger=True)
-    elif CommentCommand.USAGE.value in comment_body:
-        usage_md = get_command_usage_markdown()
-        create_github_issue_comment(issue, f"### 🤖 Available Commands\n\n{usage_md}")
-        print(f"Posted usage information for issue {issue.number}.")
-    elif CommentCommand.DISABLE.value in comment_body:
-        create_github_issue_comment(
-            issue,
-            (
-                f"🛑 Automatic reviews have been disabled for this issue. "
-                f"Comment `{CommentCommand.REVIEW.value}` to manually trigger future evaluations."
-                f"{DISABLED_MARKER}"
-            ),
-        )
+
+async def _usage(issue: Issue, get_kernel: Callable[[], "Kernel"], existing_labels: list[str]) -> None:
+    """
+    Post the list of available commands.
+    """
+    usage_md = get_command_usage_markdown()
+    create_github_issue_comment(issue, f"### 🤖 Available Commands\n\n{usage_md}")
+    print(f"Posted usage information for issue {issue.number}.")
+
+
+async def _disable(issue: Issue, get_kernel: Callable[[], "Kernel"], existing_labels: list[str]) -> None:
+    """
+    Turn off automatic reviews by posting a comment carrying the disabled marker.
+    """
+    create_github_issue_comment(
+        issue,
+        (
+            f"🛑 Automatic reviews have been disabled for this issue. "
+            f"Comment `{CommentCommand.REVIEW.value}` to manually trigger future evaluations."
+            f"{DISABLED_MARKER}"
+        ),
+    )
+
+
+# Every command handler takes the same arguments, so new commands only need an entry here
+_COMMAND_HANDLERS = {
+    CommentCommand.APPLY: _apply,
+    CommentCommand.REVIEW: _review,
+    CommentCommand.USAGE: _usage,
+    CommentCommand.DISABLE: _disable,
+}
+
+
+async def handle_github_comment_event(
+    issue: Issue, issue_comment_id: int, get_kernel: Callable[[], "Kernel"], existing_labels: list[str]
+) -> None:
+    """
+    Apply AI-suggested enhancements to a GitHub issue, or trigger a re-review if requested in a comment.
+
+    Args:
+        issue (Issue): The GitHub issue to update.
+        issue_comment_id (int): The ID of the comment triggering the enhancement or review.
+    """
+    comment = get_github_comment(issue, issue_comment_id)
+    handler = _COMMAND_HANDLERS.get(find_comment_command(comment.body.strip().lower()))
+
+    if handler:
+        await handler(issue, get_kernel, existing_labels)
     else:
         print(f"Comment {issue_comment_id} does not require processing.")
 
@@ -115,27 +178,36 @@ async def main() -> None:
 
     config = Config()
 
-    github_issue = get_github_issue(
-        token=config.github.token,
-        repository=config.github.repository,
-        issue_id=config.github.issue_id,
+    # The issue and the label list are independent requests, so fetch them concurrently
+    github_issue, existing_labels = await asyncio.gather(
+        asyncio.to_thread(
+            get_github_issue,
+            token=config.github.token,
+            repository=config.github.repository,
+            issue_id=config.github.issue_id,
+        ),
+        asyncio.to_thread(get_existing_labels, config.github.token, config.github.repository),
     )
 
-    existing_labels = get_existing_labels(config.github.token, config.github.repository)
-
     print(f"Existing labels for repository '{config.github.repository}': {existing_labels}")
     print(f"Processing issue: {github_issue.title}")
     print(f"Event Name: {config.github.event_name}")
 
-    kernel = initialize_kernel(
+    # Only events that actually call the model build the kernel
+    get_kernel = functools.partial(
+        initialize_kernel,
         azure_openai_target_uri=config.openai.azure_openai_target_uri,
         azure_openai_api_key=config.openai.azure_openai_api_key,
     )
 
+    completion_cache = CompletionCache(config.openai.completion_cache_dir)
+
     event_handlers = {
-        GithubEvent.ISSUE: lambda: handle_github_issues_event(github_issue, kernel, existing_labels),
+        GithubEvent.ISSUE: lambda: handle_github_issues_event(
+            github_issue, get_kernel, existing_labels, completion_cache=completion_cache
+        ),
         GithubEvent.ISSUE_COMMENT: lambda: handle_github_comment_event(
-            github_issue, config.github.issue_comment_id, kernel, existing_labels
+            github_issue, config.github.issue_comment_id, get_kernel, existing_labels
         ),
     }
 
@@ -152,4 +224,10 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Show the agent's own progress messages without the INFO chatter of third-party HTTP clients
+    logging.basicConfig(format="%(message)s", stream=sys.stdout)
+    logging.getLogger("github_utils").setLevel(logging.INFO)
+    try:
+        asyncio.run(main())
+    finally:
+        close_clients()
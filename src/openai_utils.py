@@ -1,30 +1,60 @@
+import functools
+import hashlib
+import json
 import re
 import sys
-from typing import Dict, List
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
 from urllib.parse import parse_qs, urlparse
 
-from semantic_kernel import Kernel
-from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, AzureChatPromptExecutionSettings
-from semantic_kernel.contents import ChatHistory
-from semantic_kernel.functions.kernel_arguments import KernelArguments
+# semantic_kernel is slow to import, so it is only loaded by the functions that talk to the model;
+# commands such as /apply, /usage, and /disable never pay for it
+if TYPE_CHECKING:
+    from semantic_kernel import Kernel
 
+_DEPLOYMENT_RE = re.compile(r"/deployments/([^/]+)/")
 
-def parse_azure_openai_uri(target_url: str):
+# Attempts the OpenAI client makes after the first for rate limits (429), 5xx responses, timeouts, and
+# connection errors, with jittered exponential backoff that honours Retry-After
+_MAX_RETRIES = 5
+
+# ChatHistory method that appends a message for each supported role; names rather than functions so
+# semantic_kernel stays unimported until a completion actually runs
+_ROLE_ADDERS = {
+    "system": "add_system_message",
+    "user": "add_user_message",
+    "assistant": "add_assistant_message",
+}
+
+
+class AzureOpenAIUri(NamedTuple):
+    """
+    Components of an Azure OpenAI chat completions URL.
+    """
+
+    endpoint: str
+    deployment_name: str
+    api_version: str
+
+
+@functools.lru_cache(maxsize=8)
+def parse_azure_openai_uri(target_url: str) -> AzureOpenAIUri:
     """
     Parse a full Azure OpenAI chat completions URL and extract endpoint, deployment name, and API version.
+    Results are cached per URL, since the same target URI is parsed by every consumer of the config.
 
     Args:
         target_url (str): Full Azure OpenAI chat completions URL.
 
     Returns:
-        tuple: (endpoint, deployment_name, api_version)
+        AzureOpenAIUri: (endpoint, deployment_name, api_version)
 
     Raises:
         SystemExit: If the URI is malformed or missing required components.
     """
     parsed = urlparse(target_url)
     endpoint = f"{parsed.scheme}://{parsed.netloc}/" if parsed.scheme and parsed.netloc else None
-    match = re.search(r"/deployments/([^/]+)/", parsed.path)
+    match = _DEPLOYMENT_RE.search(parsed.path)
     deployment_name = match.group(1) if match else None
     query = parse_qs(parsed.query)
     api_version = query.get("api-version", [None])[0]
@@ -34,12 +64,74 @@ def parse_azure_openai_uri(target_url: str):
             file=sys.stderr,
         )
         sys.exit(1)
-    return endpoint, deployment_name, api_version
+    return AzureOpenAIUri(endpoint, deployment_name, api_version)
+
 
+class CompletionCache:
+    """
+    Exact-match cache of chat completion responses, keyed by deployment name and prompt messages.
+    Entries are held in memory and, when a directory is given, also persisted there (one file per key)
+    so they can be carried across action runs, e.g. with actions/cache.
+    """
 
-def initialize_kernel(azure_openai_target_uri: str, azure_openai_api_key: str) -> Kernel:
+    def __init__(self, directory: Optional[str] = None):
+        self._entries: Dict[str, str] = {}
+        self._directory: Optional[Path] = Path(directory) if directory else None
+
+    @staticmethod
+    def make_key(deployment_name: str, messages: List[Dict[str, str]]) -> str:
+        """
+        Build a stable cache key from the deployment name and the serialized messages.
+        """
+        payload = json.dumps({"deployment": deployment_name, "messages": messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Return the cached response for the key, or None on a miss.
+        """
+        if key in self._entries:
+            return self._entries[key]
+        if self._directory is None:
+            return None
+        try:
+            value = (self._directory / key).read_text(encoding="utf-8")
+        except OSError:
+            return None
+        self._entries[key] = value
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store a response; failures to persist it are reported but not fatal.
+        """
+        self._entries[key] = value
+        if self._directory is None:
+            return
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            (self._directory / key).write_text(value, encoding="utf-8")
+        except OSError as e:
+            print(f"Warning: could not persist completion cache entry: {e}", file=sys.stderr)
+
+
+def _is_json(text: Optional[str]) -> bool:
+    """
+    Check whether the text parses as JSON.
+    """
+    try:
+        json.loads(text)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=4)
+def initialize_kernel(azure_openai_target_uri: str, azure_openai_api_key: str) -> "Kernel":
     """
     Initialize and return a Semantic Kernel with Azure OpenAI chat completion service.
+    Kernels are cached per target URI and key, so repeated calls share one service and its HTTP connection pool.
+    Transient failures are retried by the underlying client instead of failing the run.
 
     Args:
         azure_openai_target_uri (str): Full Azure OpenAI chat completions URL.
@@ -51,16 +143,25 @@ def initialize_kernel(azure_openai_target_uri: str, azure_openai_api_key: str) -
     Raises:
         SystemExit: If initialization fails.
     """
+    from openai import AsyncAzureOpenAI
+    from semantic_kernel import Kernel
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
+
     endpoint, deployment_name, api_version = parse_azure_openai_uri(azure_openai_target_uri)
     kernel = Kernel()
     try:
+        client = AsyncAzureOpenAI(
+            api_key=azure_openai_api_key,
+            azure_endpoint=endpoint,
+            azure_deployment=deployment_name,
+            api_version=api_version,
+            max_retries=_MAX_RETRIES,
+        )
         kernel.add_service(
             AzureChatCompletion(
                 service_id="azure-openai",
-                api_key=azure_openai_api_key,
-                endpoint=endpoint,
                 deployment_name=deployment_name,
-                api_version=api_version,
+                async_client=client,
             )
         )
         return kernel
@@ -69,7 +170,9 @@ def initialize_kernel(azure_openai_target_uri: str, azure_openai_api_key: str) -
         sys.exit(1)
 
 
-async def run_completion(kernel: Kernel, messages: List[Dict[str, str]]) -> str:
+async def run_completion(
+    kernel: "Kernel", messages: List[Dict[str, str]], cache: Optional[CompletionCache] = None
+) -> str:
     """
     Run a chat completion using the provided kernel and message history.
 
@@ -77,32 +180,42 @@ async def run_completion(kernel: Kernel, messages: List[Dict[str, str]]) -> str:
         kernel (Kernel): The Semantic Kernel instance with Azure OpenAI service.
         messages (List[Dict[str, str]]): List of message dicts with 'role' and 'content'.
             Supported roles: 'system', 'user', 'assistant'.
+        cache (CompletionCache, optional): Response cache to consult before calling the model. Defaults to None.
 
     Returns:
         str: The content of the completion response.
 
     Raises:
         SystemExit: If the chat service is not available.
+        ValueError: If a message has an unsupported role.
     """
+    from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion, AzureChatPromptExecutionSettings
+    from semantic_kernel.contents import ChatHistory
+    from semantic_kernel.functions.kernel_arguments import KernelArguments
+
     chat_service: AzureChatCompletion = kernel.get_service("azure-openai")
 
     if not chat_service:
         print("Azure OpenAI service is not available in the kernel.", file=sys.stderr)
         sys.exit(1)
 
+    cache_key = None
+    if cache is not None:
+        cache_key = CompletionCache.make_key(chat_service.ai_model_id, messages)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     history = ChatHistory()
 
     for msg in messages:
-        role = msg.get("role")
-        content = msg.get("content", "")
-        if role == "system":
-            history.add_system_message(content)
-        elif role == "user":
-            history.add_user_message(content)
-        elif role == "assistant":
-            history.add_assistant_message(content)
+        adder = _ROLE_ADDERS.get(msg.get("role"))
+        if adder is None:
+            raise ValueError(f"Unsupported message role: {msg.get('role')!r}")
+        getattr(history, adder)(msg.get("content", ""))
 
-    settings = AzureChatPromptExecutionSettings(store=True)
+    # JSON mode guarantees a parseable object, which is what every prompt asks for
+    settings = AzureChatPromptExecutionSettings(store=True, response_format={"type": "json_object"})
 
     result = await chat_service.get_chat_message_content(
         chat_history=history,
@@ -111,4 +224,8 @@ async def run_completion(kernel: Kernel, messages: List[Dict[str, str]]) -> str:
         kernel_arguments=KernelArguments(),
     )
 
+    # All prompts require a JSON reply; never cache a malformed one, or every later hit would fail the same way
+    if cache is not None and _is_json(result.content):
+        cache.set(cache_key, result.content)
+
     return result.content
@@ -1,5 +1,56 @@
+import functools
 import json
-from typing import List, Optional
+import re
+from typing import Iterator, List, Optional, Tuple
+
+from utils import get_env_var
+
+# Hidden payload carrying the evaluation as JSON, so /apply can reload it without re-parsing the markdown.
+# Only the block to_comment() appends at the very end counts: the rendered fields above it can echo text from
+# the issue, including a crafted payload. The payload escapes ">", so it can never contain one.
+_EVAL_DATA_RE = re.compile(r"<!-- agent:evaluation ([^>]*) -->\s*\Z")
+
+# One match per line of a refactored story: a bold section header with its value, a list item,
+# or any other line (which ends the acceptance criteria list); surrounding whitespace is left out of the groups
+_REFACTORED_LINE_RE = re.compile(
+    r"^[^\S\n]*(?:\*\*(?P<key>title|description|acceptance criteria)\*\*:[^\S\n]*(?P<value>.*?)"
+    r"|-[- ]*(?P<item>.*?)|.*?)[^\S\n]*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Comma-separated labels with the whitespace around each one trimmed and empty entries skipped
+_LABELS_RE = re.compile(r"[^,\s]+(?:[^,]*[^,\s])?")
+
+_YES = "✅"
+_NO = "❌"
+_TRUE = frozenset({"yes", "true", _YES})
+
+# Fixed part of the evaluation comment, rendered in a single format_map pass
+_EVAL_TEMPLATE = (
+    "### 🤖 **AI-enhanced Evaluation**\n"
+    "**Summary**: {summary}\n"
+    "**Completeness**:\n"
+    " - Title: {title_complete}\n\n"
+    " - Description: {description_complete}\n\n"
+    " - Acceptance Criteria: {acceptance_criteria_complete}\n\n\n"
+    "**Importance**: {importance}\n\n\n"
+    "**Acceptance Criteria Evaluation**: {acceptance_criteria_evaluation}\n\n\n"
+    "**Suggested Labels**: {labels}\n\n\n"
+    "**Ready to Work**: {ready_to_work}\n"
+)
+
+# Optional sections after the template; the heading and the unclear-story reason are also what
+# the markdown parser looks for, so rendering and parsing cannot drift apart
+_REFACTORED_HEADING = "### Refactored Story"
+_UNCLEAR_REASON = "could not be provided because the original story is unclear"
+_UNCLEAR_NOTICE = (
+    f"\n**❌ Refactored Story {_UNCLEAR_REASON} "
+    "or lacks meaningful value. Please rewrite the title and description to clearly explain "
+    "the story's purpose and value.**"
+)
+_APPLY_HINT = "\n Reply `/apply` to apply these changes.\n"
+_REVIEW_HINT = "\n Reply `/review` to run another evaluation.\n"
+_USAGE_HINT = "\n Reply `/usage` to see available commands.\n"
 
 
 class UserStoryRefactored:
@@ -7,6 +58,8 @@ class UserStoryRefactored:
     Model for the Refactored Story section in the AI response.
     """
 
+    __slots__ = ("title", "description", "acceptance_criteria")
+
     def __init__(
         self,
         title: str = "",
@@ -34,50 +87,241 @@ class UserStoryRefactored:
         title = ""
         description = ""
         acceptance_criteria = []
-        lines = markdown.splitlines()
-        section = None
-        for line in lines:
-            line_stripped = line.strip().lower()
-            if line_stripped.startswith("**title**:"):
-                title = line_stripped.split(":", 1)[-1].strip()
-            elif line_stripped.startswith("**description**:"):
-                description = line_stripped.split(":", 1)[-1].strip()
-            elif line_stripped.startswith("**acceptance criteria**:"):
-                section = "acceptance_criteria"
-            elif section == "acceptance_criteria" and line_stripped.startswith("-"):
-                acceptance_criteria.append(line_stripped.lstrip("- ").strip())
-            elif section == "acceptance_criteria" and not line_stripped.startswith("-"):
-                section = None
+        in_criteria = False
+        for match in _REFACTORED_LINE_RE.finditer(markdown):
+            key = match["key"]
+            if key is None:
+                if in_criteria and match["item"] is not None:
+                    acceptance_criteria.append(match["item"])
+                else:
+                    in_criteria = False
+                continue
+            key = key.lower()
+            if key == "title":
+                title = match["value"]
+            elif key == "description":
+                description = match["value"]
+            else:
+                in_criteria = True
         return cls(
             title=title,
             description=description,
             acceptance_criteria=acceptance_criteria,
         )
 
+    def to_dict(self) -> dict:
+        """
+        Convert the refactored story to the JSON shape used in the AI response.
+        """
+        return {
+            "title": self.title,
+            "description": self.description,
+            "acceptance_criteria": self.acceptance_criteria or [],
+        }
+
     def to_markdown(self) -> str:
         """
         Convert the refactored story to a markdown string.
         """
-        lines = []
+        return "\n".join(self._emit())
+
+    def body_markdown(self) -> str:
+        """
+        Convert the description and acceptance criteria to a markdown string.
+        """
+        return "\n".join(self._emit_body())
+
+    def _emit(self) -> Iterator[str]:
+        """
+        Yield the lines of the full story; an empty line separates the sections.
+        """
         if self.title:
-            lines.append(f"**Title**: {self.title}\n")
+            yield f"**Title**: {self.title}"
+            yield ""
         body = self.body_markdown()
         if body:
-            lines.append(body)
-        return "\n".join(lines)
+            yield body
 
-    def body_markdown(self) -> str:
+    def _emit_body(self) -> Iterator[str]:
         """
-        Convert the description and acceptance criteria to a markdown string.
+        Yield the lines of the description and acceptance criteria.
         """
-        lines = []
         if self.description:
-            lines.append(f"**Description**: {self.description}\n")
+            yield f"**Description**: {self.description}"
+            yield ""
         if self.acceptance_criteria:
-            lines.append("**Acceptance Criteria**:")
+            yield "**Acceptance Criteria**:"
             for criterion in self.acceptance_criteria:
-                lines.append(f"- {criterion}")
-        return "\n".join(lines)
+                yield f"- {criterion}"
+
+
+# Parsed fields are cached per input so re-reading the same response or comment skips the parse;
+# set REPOAGENT_PARSE_CACHE_SIZE=0 to turn the caches off
+_PARSE_CACHE_SIZE = get_env_var("REPOAGENT_PARSE_CACHE_SIZE", default=256, cast_func=int, required=False)
+
+
+def _iter_lines(text: str) -> Iterator[Tuple[str, int]]:
+    """
+    Yield the lines of text one at a time instead of materializing them all as splitlines() does,
+    each with the offset at which the following line starts.
+    Like splitlines(), a carriage return before the newline is not part of the line.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end < 0:
+            end = length
+        stop = end - 1 if end > start and text[end - 1] == "\r" else end
+        line_start, start = start, end + 1
+        yield text[line_start:stop], start
+
+
+def _is_true(value) -> bool:
+    """
+    Interpret a yes/no value from the model or a rendered comment, e.g. "Yes", "true", or the check mark emoji.
+    """
+    if not isinstance(value, str):
+        return bool(value)
+    value = value.strip()
+    return value in _TRUE or value.lower() in _TRUE
+
+
+def _yes_no(val: bool) -> str:
+    return "Yes" if val else "No"
+
+
+# Markdown field lines, keyed by the text before the first colon: the attribute each one sets
+# and how its value is parsed
+_MARKDOWN_FIELDS = {
+    "**Summary**": ("summary", str.strip),
+    "- Title": ("title_complete", _is_true),
+    "- Description": ("description_complete", _is_true),
+    "- Acceptance Criteria": ("acceptance_criteria_complete", _is_true),
+    "**Importance**": ("importance", str.strip),
+    "**Acceptance Criteria Evaluation**": ("acceptance_criteria_evaluation", str.strip),
+    "**Suggested Labels**": ("labels", _LABELS_RE.findall),
+    "**Ready to Work**": ("ready_to_work", _is_true),
+}
+
+
+def _story_fields(story: Optional[UserStoryRefactored]) -> Optional[tuple]:
+    """
+    Immutable copy of a refactored story's fields, safe to keep in a parse cache.
+    """
+    if story is None:
+        return None
+    return (story.title, story.description, tuple(story.acceptance_criteria or ()))
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_eval_json(text: str) -> tuple:
+    """
+    Parse the JSON evaluation into a tuple of UserStoryEvalResponse constructor arguments.
+    """
+    try:
+        data = json.loads(text)
+    except Exception as e:
+        raise ValueError(f"Failed to parse JSON from AI response: {e}\nRaw text: {text}")
+
+    summary = data.get("summary", "")
+    completeness = data.get("completeness", {})
+    title_complete = _is_true(completeness.get("title", "No"))
+    description_complete = _is_true(completeness.get("description", "No"))
+    acceptance_criteria_complete = _is_true(completeness.get("acceptance_criteria", "No"))
+    importance = data.get("importance", "")
+    acceptance_criteria_evaluation = data.get("acceptance_criteria_evaluation", "")
+    labels = data.get("labels", [])
+    ready_to_work = bool(data.get("ready_to_work", False))
+    base_story_not_clear = bool(data.get("base_story_not_clear", False))
+    refactored = None
+    if not ready_to_work and not base_story_not_clear and "refactored_story" in data:
+        refactored = UserStoryRefactored.from_dict(data["refactored_story"])
+    return (
+        summary,
+        title_complete,
+        description_complete,
+        acceptance_criteria_complete,
+        importance,
+        acceptance_criteria_evaluation,
+        tuple(labels),
+        ready_to_work,
+        base_story_not_clear,
+        _story_fields(refactored),
+    )
+
+
+@functools.lru_cache(maxsize=_PARSE_CACHE_SIZE)
+def _parse_eval_markdown(markdown: str) -> tuple:
+    """
+    Parse the markdown evaluation into a tuple of UserStoryEvalResponse constructor arguments.
+    """
+    fields = {
+        "summary": "",
+        "title_complete": False,
+        "description_complete": False,
+        "acceptance_criteria_complete": False,
+        "importance": "",
+        "acceptance_criteria_evaluation": "",
+        "labels": [],
+        "ready_to_work": False,
+    }
+    base_story_not_clear = False
+    refactored_start = None
+    for line, next_start in _iter_lines(markdown):
+        key, colon, rest = line.partition(":")
+        handler = _MARKDOWN_FIELDS.get(key.strip()) if colon else None
+        if handler is not None:
+            name, parse = handler
+            fields[name] = parse(rest)
+        elif "Base Story Not Clear:" in line:
+            base_story_not_clear = _is_true(rest)
+        elif _UNCLEAR_REASON in line:
+            base_story_not_clear = True
+        elif line.strip().startswith(_REFACTORED_HEADING):
+            # The story runs to the end of the comment; hand the rest over as one slice
+            refactored_start = next_start
+            break
+    refactored_tail = markdown[refactored_start:] if refactored_start is not None else ""
+    refactored = UserStoryRefactored.from_markdown(refactored_tail) if refactored_tail else None
+    return (
+        fields["summary"],
+        fields["title_complete"],
+        fields["description_complete"],
+        fields["acceptance_criteria_complete"],
+        fields["importance"],
+        fields["acceptance_criteria_evaluation"],
+        tuple(fields["labels"]),
+        fields["ready_to_work"],
+        base_story_not_clear,
+        _story_fields(refactored),
+    )
+
+
+# The closing sections depend only on (ready_to_work, base_story_not_clear): a story that is ready gets the
+# command hints, an unclear one a request to rewrite it, and any other the refactored story to /apply
+_HINTS = f"{_REVIEW_HINT}\n{_USAGE_HINT}"
+_UNCLEAR_TAIL = f"{_UNCLEAR_NOTICE}\n{_HINTS}"
+
+
+def _hints_tail(evaluation: "UserStoryEvalResponse") -> str:
+    return _HINTS
+
+
+def _unclear_tail(evaluation: "UserStoryEvalResponse") -> str:
+    return _UNCLEAR_TAIL
+
+
+def _refactored_tail(evaluation: "UserStoryEvalResponse") -> str:
+    return f"\n{_REFACTORED_HEADING}\n{evaluation.refactored.to_markdown()}\n{_APPLY_HINT}\n{_HINTS}"
+
+
+_TAILS = {
+    (True, False): _hints_tail,
+    (True, True): _hints_tail,
+    (False, True): _unclear_tail,
+    (False, False): _refactored_tail,
+}
 
 
 class UserStoryEvalResponse:
@@ -85,6 +329,19 @@ class UserStoryEvalResponse:
     Model for parsing and representing the AI response from the user story evaluation prompt.
     """
 
+    __slots__ = (
+        "summary",
+        "title_complete",
+        "description_complete",
+        "acceptance_criteria_complete",
+        "importance",
+        "acceptance_criteria_evaluation",
+        "labels",
+        "ready_to_work",
+        "base_story_not_clear",
+        "refactored",
+    )
+
     def __init__(
         self,
         summary: str,
@@ -114,129 +371,96 @@ class UserStoryEvalResponse:
         """
         Parse the AI response text (expected to be JSON) and return a UserStoryEvalResponse instance.
         """
-        try:
-            data = json.loads(text)
-        except Exception as e:
-            raise ValueError(f"Failed to parse JSON from AI response: {e}\nRaw text: {text}")
-
-        summary = data.get("summary", "")
-        completeness = data.get("completeness", {})
-        title_complete = completeness.get("title", "No").lower() == "yes"
-        description_complete = completeness.get("description", "No").lower() == "yes"
-        acceptance_criteria_complete = completeness.get("acceptance_criteria", "No").lower() == "yes"
-        importance = data.get("importance", "")
-        acceptance_criteria_evaluation = data.get("acceptance_criteria_evaluation", "")
-        labels = data.get("labels", [])
-        ready_to_work = bool(data.get("ready_to_work", False))
-        base_story_not_clear = bool(data.get("base_story_not_clear", False))
-        refactored = None
-        if not ready_to_work and not base_story_not_clear and "refactored_story" in data:
-            refactored = UserStoryRefactored.from_dict(data["refactored_story"])
-        else:
-            refactored = UserStoryRefactored()
-        return cls(
-            summary,
-            title_complete,
-            description_complete,
-            acceptance_criteria_complete,
-            importance,
-            acceptance_criteria_evaluation,
-            labels,
-            ready_to_work,
-            base_story_not_clear,
-            refactored,
-        )
+        return cls._from_fields(_parse_eval_json(text))
+
+    @classmethod
+    def _from_fields(cls, fields: tuple):
+        """
+        Build a fresh instance from cached parse results, so callers never share mutable state.
+        """
+        *values, labels, ready_to_work, base_story_not_clear, refactored = fields
+        if refactored is not None:
+            title, description, acceptance_criteria = refactored
+            refactored = UserStoryRefactored(title, description, list(acceptance_criteria))
+        return cls(*values, list(labels), ready_to_work, base_story_not_clear, refactored)
 
     @classmethod
     def from_markdown(cls, markdown: str):
         """
         Parse a markdown string and return a UserStoryEvalResponse instance.
         """
+        return cls._from_fields(_parse_eval_markdown(markdown))
 
-        def emoji_to_bool(val: str) -> bool:
-            return val.strip() == "✅"
-
-        lines = markdown.splitlines()
-        summary = ""
-        title_complete = False
-        description_complete = False
-        acceptance_criteria_complete = False
-        importance = ""
-        acceptance_criteria_evaluation = ""
-        labels = []
-        ready_to_work = False
-        base_story_not_clear = False
-        refactored_md = []
-        in_refactored = False
-        for line in lines:
-            if line.startswith("**Summary**:"):
-                summary = line.split(":", 1)[-1].strip()
-            elif line.strip().startswith("- Title:"):
-                title_complete = emoji_to_bool(line.split(":", 1)[-1].strip())
-            elif line.strip().startswith("- Description:"):
-                description_complete = emoji_to_bool(line.split(":", 1)[-1].strip())
-            elif line.strip().startswith("- Acceptance Criteria:"):
-                acceptance_criteria_complete = emoji_to_bool(line.split(":", 1)[-1].strip())
-            elif line.startswith("**Importance**:"):
-                importance = line.split(":", 1)[-1].strip()
-            elif line.startswith("**Acceptance Criteria Evaluation**:"):
-                acceptance_criteria_evaluation = line.split(":", 1)[-1].strip()
-            elif line.startswith("**Suggested Labels**:"):
-                labels = [line_split.strip() for line_split in line.split(":", 1)[-1].split(",") if line_split.strip()]
-            elif line.startswith("**Ready to Work**:"):
-                ready_to_work = emoji_to_bool(line.split(":", 1)[-1].strip())
-            elif "Base Story Not Clear:" in line:
-                base_story_not_clear = emoji_to_bool(line.split(":", 1)[-1].strip())
-            elif "could not be provided because the original story is unclear" in line:
-                base_story_not_clear = True
-            elif line.strip().startswith("### Refactored Story"):
-                in_refactored = True
-            elif in_refactored:
-                refactored_md.append(line)
-        refactored = UserStoryRefactored.from_markdown("\n".join(refactored_md)) if refactored_md else None
+    @classmethod
+    def unclear_story(cls, summary: str):
+        """
+        Build the evaluation for a story too unclear to assess, without consulting the model.
+        """
         return cls(
-            summary,
-            title_complete,
-            description_complete,
-            acceptance_criteria_complete,
-            importance,
-            acceptance_criteria_evaluation,
-            labels,
-            ready_to_work,
-            base_story_not_clear,
-            refactored,
+            summary=summary,
+            title_complete=False,
+            description_complete=False,
+            acceptance_criteria_complete=False,
+            importance="",
+            acceptance_criteria_evaluation="",
+            labels=[],
+            ready_to_work=False,
+            base_story_not_clear=True,
         )
 
+    @classmethod
+    def from_comment(cls, comment_body: str):
+        """
+        Rebuild a UserStoryEvalResponse from a comment posted by to_comment().
+        Reads the embedded JSON payload when present and falls back to parsing the markdown for older comments.
+        """
+        match = _EVAL_DATA_RE.search(comment_body)
+        if match:
+            return cls.from_text(match.group(1))
+        return cls.from_markdown(comment_body)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the evaluation to the JSON shape used in the AI response, so from_text() can read it back.
+        """
+        data = {
+            "summary": self.summary,
+            "completeness": {
+                "title": _yes_no(self.title_complete),
+                "description": _yes_no(self.description_complete),
+                "acceptance_criteria": _yes_no(self.acceptance_criteria_complete),
+            },
+            "importance": self.importance,
+            "acceptance_criteria_evaluation": self.acceptance_criteria_evaluation,
+            "labels": self.labels,
+            "ready_to_work": self.ready_to_work,
+            "base_story_not_clear": self.base_story_not_clear,
+        }
+        if self.refactored and not self.ready_to_work and not self.base_story_not_clear:
+            data["refactored_story"] = self.refactored.to_dict()
+        return data
+
+    def to_comment(self) -> str:
+        """
+        Render the evaluation as markdown followed by a hidden JSON payload for from_comment().
+        """
+        # Escaping ">" keeps the JSON valid while guaranteeing it cannot close the HTML comment early;
+        # compact separators keep the hidden payload, and the comment body it is parsed from, small
+        payload = json.dumps(self.to_dict(), ensure_ascii=False, separators=(",", ":")).replace(">", "\\u003e")
+        return f"{self.to_markdown()}\n<!-- agent:evaluation {payload} -->"
+
     def to_markdown(self) -> str:
-        def yn_emoji(val: bool) -> str:
-            return "✅" if val else "❌"
-
-        lines = [
-            "### 🤖 **AI-enhanced Evaluation**",
-            f"**Summary**: {self.summary}",
-            "**Completeness**:",
-            f" - Title: {yn_emoji(self.title_complete)}\n",
-            f" - Description: {yn_emoji(self.description_complete)}\n",
-            f" - Acceptance Criteria: {yn_emoji(self.acceptance_criteria_complete)}\n\n",
-            f"**Importance**: {self.importance}\n\n",
-            f"**Acceptance Criteria Evaluation**: {self.acceptance_criteria_evaluation}\n\n",
-            f"**Suggested Labels**: {', '.join(self.labels)}\n\n",
-            f"**Ready to Work**: {yn_emoji(self.ready_to_work)}\n",
-        ]
-        if not self.ready_to_work and self.base_story_not_clear:
-            lines.append(
-                (
-                    "\n**❌ Refactored Story could not be provided because the original story is unclear "
-                    "or lacks meaningful value. Please rewrite the title and description to clearly explain "
-                    "the story's purpose and value.**"
-                )
-            )
-        if self.refactored and (not self.ready_to_work and not self.base_story_not_clear):
-            lines.append("\n### Refactored Story")
-            lines.append(self.refactored.to_markdown())
-            lines.append("\n Reply `/apply` to apply these changes.\n")
-
-        lines.append("\n Reply `/review` to run another evaluation.\n")
-        lines.append("\n Reply `/usage` to see available commands.\n")
-
-        return "\n".join(lines)
+        head = _EVAL_TEMPLATE.format_map(
+            {
+                "summary": self.summary,
+                "title_complete": _YES if self.title_complete else _NO,
+                "description_complete": _YES if self.description_complete else _NO,
+                "acceptance_criteria_complete": _YES if self.acceptance_criteria_complete else _NO,
+                "importance": self.importance,
+                "acceptance_criteria_evaluation": self.acceptance_criteria_evaluation,
+                "labels": ", ".join(self.labels),
+                "ready_to_work": _YES if self.ready_to_work else _NO,
+            }
+        )
+        tail = _TAILS[bool(self.ready_to_work), bool(self.base_story_not_clear)](self)
+        return f"{head}\n{tail}"
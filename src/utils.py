@@ -1,8 +1,13 @@
+import functools
 import json
 import os
 from typing import Any, Callable, Optional
 
+# Bound once; os.getenv is a Python-level wrapper around the same lookup
+_env_get = os.environ.get
 
+
+@functools.lru_cache(maxsize=None)
 def get_env_var(
     key: str,
     default: Any = None,
@@ -11,6 +16,8 @@ def get_env_var(
 ) -> Any:
     """
     Retrieve an environment variable with optional casting and default value management.
+    The action's environment does not change while it runs, so each resolved value is cached per argument
+    combination (default and cast_func must be hashable); call get_env_var.cache_clear() to re-read it.
 
     Args:
         key (str): The environment variable name.
@@ -24,7 +31,7 @@ def get_env_var(
     Raises:
         ValueError: If required variable is missing or casting fails.
     """
-    val = os.getenv(key)
+    val = _env_get(key)
     if val is None or val == "":
         if required:
             raise ValueError(f"Missing required environment variable: {key}")
@@ -37,14 +44,16 @@ def get_env_var(
     return val
 
 
+@functools.lru_cache(maxsize=1)
 def get_github_event_payload() -> dict:
     """
     Read and parse the GitHub event payload from GITHUB_EVENT_PATH.
+    The file does not change during a run, so it is only read once.
 
     Returns:
         dict: The parsed event payload, or an empty dict if not available.
     """
-    event_path = os.getenv("GITHUB_EVENT_PATH")
+    event_path = _env_get("GITHUB_EVENT_PATH")
     if not event_path:
         return {}
 